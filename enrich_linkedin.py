@@ -2,26 +2,41 @@
 """
 LinkedIn Enrichment Script for B@B Slack Export
 Finds LinkedIn profiles via Exa API and extracts professional info.
-Processes 10 people per run. Re-run to do the next batch.
+Processes 50 people per run (--batch N to change). Re-run to do the next batch.
 """
 
+import argparse
+import asyncio
 import csv
+import json
+import logging
 import os
+import pickle
 import re
+import sqlite3
 import sys
 import time
-from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import httpx
 from dotenv import load_dotenv
-from exa_py import Exa
+from exa_py import AsyncExa
 
 # --- Config ---
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 INPUT_CSV = os.path.join(SCRIPT_DIR, "slack.csv")
-REMAINING_CSV = os.path.join(SCRIPT_DIR, "remaining.csv")
+PROGRESS_FILE = os.path.join(SCRIPT_DIR, "progress.txt")
+LEGACY_REMAINING_CSV = os.path.join(SCRIPT_DIR, "remaining.csv")  # progress file of older versions
 OUTPUT_CSV = os.path.join(SCRIPT_DIR, "enriched_linkedin.csv")
 ERROR_LOG = os.path.join(SCRIPT_DIR, "enrichment_errors.log")
-BATCH_SIZE = 10
-RATE_LIMIT_DELAY = 1.0
+CACHE_DB = os.path.join(SCRIPT_DIR, "exa_cache.sqlite")
+CACHE_TTL = 30 * 24 * 3600  # seconds
+BATCH_SIZE = 50
+MAX_WORKERS = 5
+RPS = 5  # Exa requests per second, enforced by _limiter
+RATE_LIMIT_DELAY = 1.0  # pause between people with --no-concurrent
+SEARCH_MAX_CHARS = 5000  # profile text returned with search results
+FULL_MAX_CHARS = 10000  # profile text for the get_contents fallback
+CONTENTS_CHUNK_SIZE = 10  # URLs per get_contents request
 
 OUTPUT_FIELDS = [
     "fullname", "email", "linkedin_url", "current_title",
@@ -29,49 +44,219 @@ OUTPUT_FIELDS = [
     "bab_role", "bab_years",
 ]
 
-
-def init_remaining():
-    """Copy slack.csv to remaining.csv on first run, filtering out empty names."""
+# --- Patterns (compiled once, used for every profile) ---
+_RE_CURRENT_ROLE = re.compile(
+    r"###\s+(.+?)\s+at\s+(?:\[([^\]]+)\](?:<[^>]*>|\([^)]*\))|([^\n(]+))\s*\(Current\)"
+)
+_RE_EXP_ROLE = re.compile(
+    r"###\s+(.+?)\s+at\s+(?:\[([^\]]+)\](?:<[^>]*>|\([^)]*\))|([^\n(]+))"
+)
+_RE_CURRENT_SUFFIX = re.compile(r"\s*\(Current\)\s*$")
+_RE_LOC_PAREN = re.compile(r"\s*\([A-Z]{2}\)\s*$")
+_RE_LOC_COMMA = re.compile(r"^[A-Z][a-z]+.*,\s*[A-Z]")
+# Single-line patterns for the Experience scan in parse_linkedin_text
+# The company is part of the pattern so the lazy title can backtrack past inner " at "s
+_RE_BAB_HEADER = re.compile(r"^###\s+(.+?)\s+at\s+\[?Blockchain at Berkeley\b")
+_RE_DATE_RANGE = re.compile(r"(\w+\s+\d{4})\s*-\s*((?:\w+\s+\d{4})|Present)")
+_RE_BERKELEY = re.compile(r"berkeley", re.IGNORECASE)
+_RE_BAB_WEB = re.compile(
+    r"(?:(\w[\w\s]+?)\s+(?:of|at|for)\s+)?Blockchain at Berkeley", re.IGNORECASE
+)
+
+
+def read_input():
+    """Read slack.csv, filtering out empty names. The file itself is never modified."""
     with open(INPUT_CSV, "r", newline="") as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-        rows = [r for r in reader if r.get("fullname", "").strip()]
+        return [r for r in csv.DictReader(f) if r.get("fullname", "").strip()]
+
+
+def read_progress(total_rows):
+    """Index of the next row of read_input() to process (0 on the first run).
+
+    Runs started before progress.txt existed left a remaining.csv holding the
+    unprocessed tail of slack.csv; the index is picked up from its length.
+    """
+    try:
+        with open(PROGRESS_FILE, "r") as f:
+            return int(f.read().strip() or 0)
+    except FileNotFoundError:
+        pass
+
+    if not os.path.exists(LEGACY_REMAINING_CSV):
+        return 0
+    with open(LEGACY_REMAINING_CSV, "r", newline="") as f:
+        remaining = sum(1 for _ in csv.DictReader(f))
+    start = max(total_rows - remaining, 0)
+    print(f"Resuming from remaining.csv: {remaining} people left, starting at row {start}.")
+    return start
+
+
+def write_progress(next_index):
+    with open(PROGRESS_FILE, "w") as f:
+        f.write(f"{next_index}\n")
 
-    with open(REMAINING_CSV, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
 
-    return rows, fieldnames
+_out_fh = None
+_out_writer = None
 
 
-def read_remaining():
-    """Read the remaining.csv file."""
-    with open(REMAINING_CSV, "r", newline="") as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-        rows = list(reader)
-    return rows, fieldnames
+def open_output():
+    """Open the output CSV once per run, writing the header if the file is new."""
+    global _out_fh, _out_writer
+    new_file = not os.path.exists(OUTPUT_CSV)
+    _out_fh = open(OUTPUT_CSV, "a", newline="", buffering=1 << 16)
+    _out_writer = csv.writer(_out_fh)
+    if new_file:
+        _out_writer.writerow(OUTPUT_FIELDS)
 
 
-def write_remaining(rows, fieldnames):
-    """Rewrite remaining.csv without the processed rows."""
-    with open(REMAINING_CSV, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+def close_output():
+    _out_fh.close()
 
 
-def append_result(row_dict):
-    """Append a single row to the output CSV."""
-    with open(OUTPUT_CSV, "a", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS)
-        writer.writerow(row_dict)
+def append_result(row_tuple):
+    """Append a single row (values in OUTPUT_FIELDS order) to the output CSV."""
+    _out_writer.writerow(row_tuple)
+
+
+logger = logging.getLogger("enrich")
+_log_handler = logging.FileHandler(ERROR_LOG, delay=True)
+_log_handler.setFormatter(logging.Formatter("[%(asctime)s] %(message)s"))
+logger.addHandler(_log_handler)
+logger.setLevel(logging.ERROR)
 
 
 def log_error(email, fullname, error_msg):
-    with open(ERROR_LOG, "a") as f:
-        f.write(f"[{datetime.now().isoformat()}] {fullname} ({email}): {error_msg}\n")
+    logger.error("%s (%s): %s", fullname, email, error_msg)
+
+
+class RateLimiter:
+    """Token bucket allowing `rate` calls per second, with bursts of up to `rate` calls.
+
+    Everything runs on one event loop, so acquire needs no lock.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.last = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+_limiter = RateLimiter(RPS)
+
+
+_cache_db = None
+
+
+def init_cache():
+    """Open the on-disk Exa response cache."""
+    global _cache_db
+    _cache_db = sqlite3.connect(CACHE_DB)
+    _cache_db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, ts INTEGER, payload BLOB)")
+    _cache_db.commit()
+
+
+def cache_get(key):
+    if _cache_db is None:
+        return None
+    row = _cache_db.execute("SELECT ts, payload FROM cache WHERE key = ?", (key,)).fetchone()
+    if not row or time.time() - row[0] > CACHE_TTL:
+        return None
+    return pickle.loads(row[1])
+
+
+def cache_put(key, value):
+    if _cache_db is None:
+        return
+    _cache_db.execute(
+        "INSERT OR REPLACE INTO cache (key, ts, payload) VALUES (?, ?, ?)",
+        (key, int(time.time()), pickle.dumps(value)),
+    )
+    _cache_db.commit()
+
+
+def with_scheme(url):
+    """Add https:// to hand-entered URLs like "linkedin.com/in/alsmith"."""
+    url = url.strip()
+    return url if "://" in url else f"https://{url}"
+
+
+def normalize_url(url):
+    """Canonical form of a LinkedIn URL for matching and cache keys.
+
+    Drops the scheme, a leading "www.", the trailing slash and trk params, and
+    lowercases the host, so http/https and hand-entered variants compare equal.
+    """
+    parts = urlsplit(with_scheme(url))
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if not k.startswith("trk")])
+    return host + parts.path.rstrip("/") + (f"?{query}" if query else "")
+
+
+async def cached_search(exa, query, **kwargs):
+    """exa.search_and_contents, served from the cache when the same query was run recently."""
+    key = "search:" + " ".join(query.lower().split()) + ":" + json.dumps(kwargs, sort_keys=True)
+    result = cache_get(key)
+    if result is None:
+        await _limiter.acquire()
+        result = await exa.search_and_contents(query, **kwargs)
+        cache_put(key, result)
+    return result
+
+
+async def cached_get_contents(exa, urls, **kwargs):
+    """exa.get_contents for many URLs, only requesting the ones not already cached.
+
+    Returns {requested url: content result} for every URL that came back (cached
+    or freshly fetched). Exa may return a rewritten URL, so fresh results are
+    matched to the request by id/url and, failing that, by position; each one is
+    cached under the requested URL so the next run hits the cache.
+    """
+    opts = json.dumps(kwargs, sort_keys=True)
+    found = {}
+    misses = []
+    for url in urls:
+        cached = cache_get(f"contents:{normalize_url(url)}:{opts}")
+        if cached is None:
+            misses.append(url)
+        else:
+            found[url] = cached
+
+    if misses:
+        await _limiter.acquire()
+        content = await exa.get_contents(misses, **kwargs)
+        by_key = {normalize_url(u): u for u in misses}
+        unmatched = []
+        for r in content.results:
+            requested = by_key.get(normalize_url(r.id or "")) or by_key.get(normalize_url(r.url or ""))
+            if requested is None:
+                unmatched.append(r)
+                continue
+            found[requested] = r
+        if unmatched and len(content.results) == len(misses):
+            # Exa answers in request order; fall back to that for results we couldn't match
+            for url, r in zip(misses, content.results):
+                if url not in found and any(r is u for u in unmatched):
+                    found[url] = r
+        for url in misses:
+            if url in found:
+                cache_put(f"contents:{normalize_url(url)}:{opts}", found[url])
+    return found
+
+
+_DIGIT_TRANS = str.maketrans("", "", "0123456789")
 
 
 def guess_fullname(row):
@@ -89,7 +274,7 @@ def guess_fullname(row):
     # Try matching first name at start of email prefix
     first_lower = fullname.lower()
     for source in [email_prefix, username]:
-        source_lower = source.lower().rstrip("0123456789")
+        source_lower = source.lower().translate(_DIGIT_TRANS).rstrip("_-.")
         if source_lower.startswith(first_lower) and len(source_lower) > len(first_lower):
             rest = source_lower[len(first_lower):]
             if rest.isalpha() and len(rest) > 1:
@@ -121,56 +306,67 @@ def parse_linkedin_text(text):
     current_company = ""
 
     # First try to find a role marked (Current)
-    current_match = re.search(
-        r"###\s+(.+?)\s+at\s+(?:\[([^\]]+)\](?:<[^>]*>|\([^)]*\))|([^\n(]+))\s*\(Current\)",
-        text
-    )
+    current_match = _RE_CURRENT_ROLE.search(text)
     if not current_match:
         # Fall back to first role under ## Experience
         exp_pos = text.find("## Experience")
         if exp_pos != -1:
             exp_text = text[exp_pos:]
-            current_match = re.search(
-                r"###\s+(.+?)\s+at\s+(?:\[([^\]]+)\](?:<[^>]*>|\([^)]*\))|([^\n(]+))",
-                exp_text
-            )
+            current_match = _RE_EXP_ROLE.search(exp_text)
 
     if current_match:
         current_title = current_match.group(1).strip()
         current_company = (current_match.group(2) or current_match.group(3) or "").strip()
-        current_company = re.sub(r"\s*\(Current\)\s*$", "", current_company).strip()
+        current_company = _RE_CURRENT_SUFFIX.sub("", current_company).strip()
 
     # Location: LinkedIn format is "City, State, Country (XX)" before connections line
     location = ""
     for line in lines[2:6]:
-        if re.search(r"connections|followers", line, re.IGNORECASE):
-            break
-        if re.search(r"\([A-Z]{2}\)\s*$", line):
-            location = re.sub(r"\s*\([A-Z]{2}\)\s*$", "", line).strip()
+        low = line.lower()
+        if "connections" in low or "followers" in low:
             break
-        if re.match(r"^[A-Z][a-z]+.*,\s*[A-Z]", line) and "at " not in line and "##" not in line:
-            location = line.strip()
+        # Cheap character checks first; lines are already stripped
+        code = line[-3:-1]
+        if len(line) > 4 and line[-1] == ")" and line[-4] == "(" and code.isalpha() and code.isupper():
+            location = _RE_LOC_PAREN.sub("", line).strip()
             break
+        if "," in line and "at " not in line and "##" not in line and line[:1].isupper():
+            if _RE_LOC_COMMA.match(line):
+                location = line
+                break
 
-    education = "UC Berkeley" if "berkeley" in text.lower() else ""
+    education = "UC Berkeley" if _RE_BERKELEY.search(text) else ""
 
     # Extract B@B role and years from experience
-    # LinkedIn text has blank lines between ### header and date, so use \s* to bridge them
+    # One pass over the lines: remember the last ### B@B role header and pair it with the
+    # first date range that follows (LinkedIn puts blank lines between the two)
     bab_role = ""
     bab_years = ""
-    bab_matches = re.findall(
-        r"###\s+(.+?)\s+at\s+(?:\[)?Blockchain at Berkeley(?:\])?(?:<[^>]*>|\([^)]*\))?"
-        r"[\s\S]*?(\w+\s+\d{4})\s*-\s*((?:\w+\s+\d{4})|Present)",
-        text
-    )
-    if bab_matches:
-        # Use the earliest B@B role (first chronologically = last in list)
-        roles = []
-        for role, start, end in bab_matches:
-            roles.append(role.strip())
+    roles = []
+    first_dates = None  # latest B@B role (LinkedIn lists newest first)
+    last_dates = None  # earliest B@B role
+    pending_role = None
+    for line in lines:
+        dates = None
+        if line.startswith("#"):
+            pending_role = None
+            header = _RE_BAB_HEADER.match(line)
+            if header:
+                pending_role = header.group(1)
+                # Dates are usually on a later line, but can share the header line
+                dates = _RE_DATE_RANGE.search(line, header.end())
+        elif pending_role is not None:
+            dates = _RE_DATE_RANGE.search(line)
+        if dates:
+            roles.append(pending_role.strip())
+            if first_dates is None:
+                first_dates = dates
+            last_dates = dates
+            pending_role = None
+    if roles:
         bab_role = " / ".join(roles)
         # Date range: earliest start to latest end
-        bab_years = f"{bab_matches[-1][1]} - {bab_matches[0][2]}"
+        bab_years = f"{last_dates.group(1)} - {first_dates.group(2)}"
 
     return {
         "current_title": current_title,
@@ -183,64 +379,91 @@ def parse_linkedin_text(text):
     }
 
 
-def name_matches(fullname, title, url=""):
-    """Check if the person's name appears in the LinkedIn result title or URL."""
-    name_parts = fullname.lower().split()
-    title_lower = title.lower() if title else ""
-    url_lower = url.lower() if url else ""
-    first = name_parts[0] if name_parts else ""
-    last = name_parts[-1] if len(name_parts) > 1 else ""
+def name_matches(first, last, title_lower, url_lower):
+    """Check if the person's name appears in the LinkedIn result title or URL.
 
+    All arguments are expected to be lowercased already; last is "" for single-word names.
+    """
     first_in = first in title_lower
     # Last name can match in title OR in URL slug (handles "Ashvin N." with url /ashvinnihalani)
     last_in = not last or last in title_lower or last in url_lower
     return first_in and last_in
 
 
-def search_linkedin(exa, fullname, row):
-    """Search for a person's LinkedIn profile using Exa API."""
-    search_name = guess_fullname(row) if " " not in fullname else fullname
+async def search_linkedin(exa, search_name):
+    """Search for a person's LinkedIn profile using Exa API.
+
+    Returns (url, text, needs_refetch). needs_refetch is True when the search
+    text is missing or may be truncated and url should be re-read via fetch_full_texts.
+    """
     query = f"{search_name} Berkeley"
 
-    result = exa.search_and_contents(
+    result = await cached_search(
+        exa,
         query,
         num_results=5,
         category="people",
         include_domains=["linkedin.com"],
-        text={"include_html_tags": False, "max_characters": 10000},
+        text={"include_html_tags": False, "max_characters": SEARCH_MAX_CHARS},
     )
 
-    # Filter to results that match the name
-    matches = [r for r in result.results if name_matches(search_name, r.title, r.url)]
+    # Filter to results that match the name (lowercase the name and each candidate once)
+    name_parts = search_name.lower().split()
+    first = name_parts[0] if name_parts else ""
+    last = name_parts[-1] if len(name_parts) > 1 else ""
+    cand_lower = [
+        (r, r.title.lower() if r.title else "", r.url.lower() if r.url else "")
+        for r in result.results
+    ]
+    matches = [r for r, title_lower, url_lower in cand_lower if name_matches(first, last, title_lower, url_lower)]
     if not matches:
-        return None, None
+        return None, None, False
 
     # Prefer matches that mention "berkeley" in their profile text (more likely the right person)
-    berkeley_matches = [r for r in matches if r.text and "berkeley" in r.text.lower()]
+    berkeley_matches = [r for r in matches if r.text and _RE_BERKELEY.search(r.text)]
     best = berkeley_matches[0] if berkeley_matches else matches[0]
 
     text = best.text
-    # If text is truncated (no Experience section), try get_contents as fallback
-    if text and "## Experience" not in text:
-        try:
-            for m in ([best] + [r for r in matches if r != best]):
-                content = exa.get_contents(
-                    [m.url],
-                    text={"include_html_tags": False, "max_characters": 10000},
-                )
-                if content.results and content.results[0].text and "## Experience" in content.results[0].text:
-                    text = content.results[0].text
-                    break
-        except Exception:
-            pass
-
-    return best.url, text
-
-
-def search_bab_web(exa, fullname):
+    # Queue the best match for the get_contents fallback if the text is missing or may be cut
+    # off: it hit the SEARCH_MAX_CHARS cap, or stops before the Experience section
+    needs_refetch = not text or len(text) >= SEARCH_MAX_CHARS or "## Experience" not in text
+
+    return best.url, text, needs_refetch
+
+
+async def fetch_full_texts(exa, urls):
+    """Fetch full profile text for urls, CONTENTS_CHUNK_SIZE URLs per get_contents call.
+
+    Returns (texts, failures): {normalized requested url: text} for every profile
+    that came back with text, and {normalized url: error message} for URLs whose chunk failed.
+    """
+    urls = list(dict.fromkeys(urls))
+
+    async def fetch_chunk(chunk):
+        return await cached_get_contents(
+            exa,
+            chunk,
+            text={"include_html_tags": False, "max_characters": FULL_MAX_CHARS},
+        )
+
+    chunks = [urls[i:i + CONTENTS_CHUNK_SIZE] for i in range(0, len(urls), CONTENTS_CHUNK_SIZE)]
+    outcomes = await asyncio.gather(*(fetch_chunk(c) for c in chunks), return_exceptions=True)
+
+    texts = {}
+    failures = {}
+    for chunk, outcome in zip(chunks, outcomes):
+        if isinstance(outcome, Exception):
+            failures.update((normalize_url(u), str(outcome)) for u in chunk)
+            continue
+        texts.update((normalize_url(url), r.text) for url, r in outcome.items() if r.text)
+    return texts, failures
+
+
+async def search_bab_web(exa, fullname):
     """Search the web for B@B role info when LinkedIn doesn't have it."""
     try:
-        result = exa.search_and_contents(
+        result = await cached_search(
+            exa,
             f'"{fullname}" "Blockchain at Berkeley"',
             num_results=3,
             text={"include_html_tags": False, "max_characters": 2000},
@@ -251,10 +474,7 @@ def search_bab_web(exa, fullname):
                 # Try to extract role from context
                 raw = r.text or ""
                 # Look for patterns like "Editor of Blockchain at Berkeley" or role mentions
-                role_match = re.search(
-                    r"(?:(\w[\w\s]+?)\s+(?:of|at|for)\s+)?Blockchain at Berkeley",
-                    raw, re.IGNORECASE
-                )
+                role_match = _RE_BAB_WEB.search(raw)
                 role = ""
                 if role_match and role_match.group(1):
                     role = role_match.group(1).strip()
@@ -267,11 +487,69 @@ def search_bab_web(exa, fullname):
     return "", ""
 
 
-def empty_row(fullname, email):
-    return {f: "" for f in OUTPUT_FIELDS} | {"fullname": fullname, "email": email}
+def empty_row(fullname, email, url=""):
+    return (fullname, email, url) + ("",) * (len(OUTPUT_FIELDS) - 3)
+
+
+async def lookup_batch(exa, search_names, known_urls, concurrent=True):
+    """Look up a whole batch on one event loop and one pooled HTTPS client.
+
+    Returns (outcomes, full_texts, fetch_failures): one search_linkedin-style result
+    or exception per name, plus the fetch_full_texts maps for every truncated profile. People
+    with a known_urls entry skip the search and only have their contents fetched.
+    With concurrent=False people are searched one at a time, RATE_LIMIT_DELAY apart.
+    """
+    sem = asyncio.Semaphore(MAX_WORKERS if concurrent else 1)
+
+    async def search_one(i, name):
+        if known_urls[i]:
+            return known_urls[i], None, True
+        async with sem:
+            if not concurrent and i > 0:
+                await asyncio.sleep(RATE_LIMIT_DELAY)
+            return await search_linkedin(exa, name)
+
+    async with exa.client:
+        # Phase 1: one search per person, up to MAX_WORKERS in flight at a time
+        outcomes = await asyncio.gather(
+            *(search_one(i, n) for i, n in enumerate(search_names)), return_exceptions=True
+        )
+        # Phase 2: batched get_contents for truncated profiles, with pre-filled URLs sent
+        # separately so one bad input URL can't fail the truncated-profile refetches
+        refetch_urls = [
+            o[0] for o, known in zip(outcomes, known_urls) if isinstance(o, tuple) and o[2] and not known
+        ]
+        prefilled_urls = [u for u in known_urls if u]
+        (full_texts, fetch_failures), (known_texts, known_failures) = await asyncio.gather(
+            fetch_full_texts(exa, refetch_urls), fetch_full_texts(exa, prefilled_urls)
+        )
+    return outcomes, full_texts | known_texts, fetch_failures | known_failures
+
+
+def positive_int(value):
+    """argparse type for counts that must be at least 1."""
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Enrich the next batch of slack.csv with LinkedIn data.")
+    parser.add_argument("--batch", type=positive_int, default=BATCH_SIZE, help="people to process this run")
+    parser.add_argument(
+        "--concurrent", action=argparse.BooleanOptionalAction, default=True,
+        help="look people up in parallel; --no-concurrent goes one at a time, RATE_LIMIT_DELAY apart",
+    )
+    parser.add_argument(
+        "--force-refresh", action="store_true",
+        help="search Exa even for rows whose input already has a linkedin_url",
+    )
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
     load_dotenv(os.path.join(SCRIPT_DIR, ".env"))
 
     api_key = os.environ.get("EXA_API_KEY")
@@ -279,67 +557,108 @@ def main():
         print("ERROR: Set your EXA_API_KEY in the .env file.")
         sys.exit(1)
 
-    exa = Exa(api_key=api_key)
+    exa = AsyncExa(api_key=api_key)
+    # Short timeout and a keep-alive pool so TLS connections are reused across the batch.
+    # AsyncExa has no option for this: its `client` property lazily builds an httpx.AsyncClient
+    # into the private `_client` attribute (exa-py 2.x), so we pre-fill that attribute. Re-check
+    # this if exa-py changes how AsyncExa creates its client.
+    exa._client = httpx.AsyncClient(
+        base_url=exa.base_url,
+        headers=exa.headers,
+        timeout=15,
+        limits=httpx.Limits(max_keepalive_connections=MAX_WORKERS),
+    )
+    init_cache()
 
-    # First run: create remaining.csv from slack.csv
-    if not os.path.exists(REMAINING_CSV):
-        rows, fieldnames = init_remaining()
-        print(f"Created remaining.csv with {len(rows)} people (filtered empty names).")
-    else:
-        rows, fieldnames = read_remaining()
+    rows = read_input()
+    start = read_progress(len(rows))
+    if start == 0:
+        print(f"Starting from the top of slack.csv: {len(rows)} people (filtered empty names).")
 
-    total_remaining = len(rows)
-    if total_remaining == 0:
-        print("All done! No one left in remaining.csv.")
+    total_remaining = len(rows) - start
+    if total_remaining <= 0:
+        print("All done! No one left to process in slack.csv.")
         return
 
-    # Create output CSV header if it doesn't exist
-    if not os.path.exists(OUTPUT_CSV):
-        with open(OUTPUT_CSV, "w", newline="") as f:
-            csv.DictWriter(f, fieldnames=OUTPUT_FIELDS).writeheader()
+    open_output()
 
-    batch = rows[:BATCH_SIZE]
+    batch = rows[start:start + args.batch]
     print(f"Processing batch of {len(batch)} (out of {total_remaining} remaining)...")
 
     found = 0
     errors = 0
 
-    for i, row in enumerate(batch):
+    # Name to search for, worked out once per person (guess_fullname returns multi-word names as-is)
+    search_names = [guess_fullname(row) for row in batch]
+    # A linkedin_url already in slack.csv (e.g. from an earlier export) skips the search
+    known_urls = []
+    for row in batch:
+        known = "" if args.force_refresh else (row.get("linkedin_url") or "").strip()
+        known_urls.append(with_scheme(known) if known else "")
+
+    outcomes, full_texts, fetch_failures = asyncio.run(
+        lookup_batch(exa, search_names, known_urls, args.concurrent)
+    )
+
+    for i, (row, search_name, outcome) in enumerate(zip(batch, search_names, outcomes)):
         fullname = row.get("fullname", "").strip()
         email = row.get("email", "").strip()
-        search_name = guess_fullname(row) if " " not in fullname else fullname
-        display = f"{search_name} ({email})" if search_name != fullname else f"{fullname} ({email})"
-        print(f"  [{i+1}/{len(batch)}] {display}...", end=" ", flush=True)
-
-        try:
-            url, text = search_linkedin(exa, fullname, row)
-            if url:
-                parsed = parse_linkedin_text(text)
-                append_result({"fullname": fullname, "email": email, "linkedin_url": url, **parsed})
-                found += 1
-                print(f"Found: {url}")
-            else:
-                append_result(empty_row(fullname, email))
-                errors += 1
-                print("Not found")
-        except Exception as e:
-            log_error(email, fullname, str(e))
+        print(f"  [{i+1}/{len(batch)}] {search_name} ({email})...", end=" ", flush=True)
+
+        if isinstance(outcome, Exception):
+            log_error(email, fullname, str(outcome))
+            append_result(empty_row(fullname, email))
+            errors += 1
+            print(f"Error: {outcome}")
+            continue
+
+        url, text, needs_refetch = outcome
+        fetch_error = ""
+        if needs_refetch:
+            key = normalize_url(url)
+            fetch_error = fetch_failures.get(key, "")
+            full_text = full_texts.get(key, "")
+            # The FULL_MAX_CHARS text starts with the same profile (or replaces a missing one)
+            if full_text:
+                text = full_text
+
+        if known_urls[i] and not text:
+            # Pre-filled linkedin_url whose profile could not be fetched
+            msg = f"could not fetch pre-filled linkedin_url {url}: {fetch_error or 'no text returned'}"
+            log_error(email, fullname, msg)
+            append_result(empty_row(fullname, email, url))
+            errors += 1
+            print(f"Error: {msg}")
+            continue
+        if fetch_error:
+            log_error(email, fullname, f"get_contents failed for {url}: {fetch_error}")
+
+        if url:
+            parsed = parse_linkedin_text(text)
+            append_result((
+                fullname, email, url, parsed["current_title"], parsed["current_company"],
+                parsed["linkedin_headline"], parsed["location"], parsed["education"],
+                parsed["bab_role"], parsed["bab_years"],
+            ))
+            found += 1
+            print(f"Found: {url}")
+        else:
             append_result(empty_row(fullname, email))
             errors += 1
-            print(f"Error: {e}")
+            print("Not found")
 
-        if i < len(batch) - 1:
-            time.sleep(RATE_LIMIT_DELAY)
+    close_output()
 
-    # Remove processed batch from remaining.csv
-    remaining_after = rows[BATCH_SIZE:]
-    write_remaining(remaining_after, fieldnames)
+    # Record where the next run should pick up
+    next_index = start + len(batch)
+    write_progress(next_index)
+    remaining_after = len(rows) - next_index
 
     print(f"\nBatch complete! Found: {found}, Not found/errors: {errors}")
-    print(f"Remaining: {len(remaining_after)} people")
+    print(f"Remaining: {remaining_after} people")
     print(f"Results appended to: {OUTPUT_CSV}")
-    if len(remaining_after) > 0:
-        print(f"Run again to process the next {min(BATCH_SIZE, len(remaining_after))}.")
+    if remaining_after > 0:
+        print(f"Run again to process the next {min(args.batch, remaining_after)}.")
 
 
 if __name__ == "__main__":